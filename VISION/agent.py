@@ -1,12 +1,9 @@
 from google.adk.agents import BaseAgent, Agent, LlmAgent, SequentialAgent, LoopAgent, ParallelAgent
-from google.adk.tools.mcp_tool.mcp_toolset import (
-    MCPToolset,
-    # StdioConnectionParams,
-    StdioServerParameters
-)
 from .custom_utils.enviroment_interaction import load_instruction_from_file
+from .custom_utils.parallel_tools import parallelize
 from .tools.fileEditor import (
     read_file,
+    read_files,
     write_file,
     delete_file,
     list_directory,
@@ -19,6 +16,7 @@ from .tools.videoAnalyzer import (
     # analyze_video_visuals_only,
     analyze_video_with_custom_prompt
 )
+from .tools.youtubeDownloader import download_video_async
 from dotenv import load_dotenv
 # import asyncio
 import os
@@ -33,18 +31,24 @@ root_agent = LlmAgent(
     # description='A helpful assistant for user questions.',
     # instruction='Answer user questions to the best of your knowledge',
     instruction=load_instruction_from_file("main.prompt", subs={}),
-    tools=[
+    tools=parallelize([
         # File Editor Tools
         read_file,
+        read_files,
         write_file,
         delete_file,
         list_directory,
         create_directory,
         get_file_info,
+    ]) + [
+        # Video tools are async already and can legitimately run for longer than the
+        # tool timeout; a timeout would only abandon them while their threads keep going
         # # Video Analyzer Tools
         # analyze_video,
         # analyze_video_transcript_only,
         # analyze_video_visuals_only,
-        analyze_video_with_custom_prompt
+        analyze_video_with_custom_prompt,
+        # YouTube Downloader Tools
+        download_video_async
     ]
 )
@@ -3,7 +3,7 @@ V.I.S.I.O.N Application
 """
 import streamlit as st
 import requests
-import json
+import orjson
 import os
 import uuid
 import time
@@ -56,7 +56,7 @@ def create_session():
     response = requests.post(
         f"{API_BASE_URL}/apps/{APP_NAME}/users/{st.session_state.user_id}/sessions/{session_id}",
         headers={"Content-Type": "application/json"},
-        data=json.dumps({})
+        data=orjson.dumps({})
     )
     
     if response.status_code == 200:
@@ -103,7 +103,7 @@ def send_message(message):
     response = requests.post(
         f"{API_BASE_URL}/run",
         headers={"Content-Type": "application/json"},
-        data=json.dumps({
+        data=orjson.dumps({
             "app_name": APP_NAME,
             "user_id": st.session_state.user_id,
             "session_id": st.session_state.session_id,
@@ -119,7 +119,7 @@ def send_message(message):
         return False
     
     # Process the response
-    events = response.json()
+    events = orjson.loads(response.content)
     
     # Extract assistant's text response
     assistant_message = None
@@ -1,6 +1,13 @@
 from string import Template
+import functools
 import os
 
+@functools.lru_cache(maxsize=8)
+def _read_prompt_file(filepath: str) -> str:
+    """Reads a prompt file once per process (cached by path)."""
+    with open(filepath, "r", encoding="utf-8") as f:
+        return f.read()
+
 def load_instruction_from_file(
     filename: str, default_instruction: str = "Default instruction.", subs:dict = {}
 ) -> str:
@@ -9,8 +16,7 @@ def load_instruction_from_file(
     try:
         # Construct path relative to the current script file (__file__)
         filepath = os.path.join(os.path.dirname(__file__), "prompts", filename)
-        with open(filepath, "r", encoding="utf-8") as f:
-            instruction = f.read()
+        instruction = _read_prompt_file(filepath)
         print(f"Successfully loaded instruction from {filename}")
     except FileNotFoundError:
         print(f"WARNING: Instruction file not found: {filepath}. Using default.")
@@ -18,4 +24,4 @@ def load_instruction_from_file(
         print(f"ERROR loading instruction file {filepath}: {e}. Using default.")
     instruction = Template(instruction)
     instruction = instruction.safe_substitute(subs) # .substitute(subs  )
-    return instruction
\ No newline at end of file
+    return instruction
@@ -0,0 +1,71 @@
+import asyncio
+import functools
+import inspect
+import os
+
+"""
+Concurrent tool execution for ADK Agents.
+ADK already gathers the function calls of one model turn, but synchronous tools
+run directly on the event loop, so they still execute one after another.
+"""
+
+# Per-tool timeout in seconds (video analysis can legitimately take minutes)
+DEFAULT_TOOL_TIMEOUT = 600.0
+
+
+def tool_timeout() -> float:
+    """Per-tool timeout from VISION_TOOL_TIMEOUT, read at call time so values from .env apply."""
+    try:
+        return float(os.getenv('VISION_TOOL_TIMEOUT', DEFAULT_TOOL_TIMEOUT))
+    except ValueError:
+        return DEFAULT_TOOL_TIMEOUT
+
+
+def parallel_tool(func, timeout: float = None):
+    """
+    Wrap a tool so concurrent calls overlap instead of blocking the event loop.
+
+    Sync tools are moved onto a worker thread, every call is bounded by a timeout
+    and exceptions are returned as error dicts so one failure doesn't abort the batch.
+    On timeout only the awaiting coroutine is cancelled: a worker thread cannot be
+    stopped and keeps running in the background, so only wrap short tools that are
+    safe to abandon (not downloads or model calls).
+
+    Args:
+        func: The tool function (sync or async)
+        timeout: Seconds before the call is abandoned (default: tool_timeout() at call time)
+
+    Returns:
+        An async function with the same name, signature and docstring as func
+    """
+    is_async = inspect.iscoroutinefunction(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        limit = timeout if timeout is not None else tool_timeout()
+        if is_async:
+            call = func(*args, **kwargs)
+        else:
+            call = asyncio.to_thread(func, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(call, timeout=limit)
+        except asyncio.TimeoutError:
+            return {
+                "success": False,
+                "error": f"Tool '{func.__name__}' timed out after {limit:g} seconds"
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Tool '{func.__name__}' failed: {str(e)}"
+            }
+
+    return wrapper
+
+
+def parallelize(tools: list, timeout: float = None) -> list:
+    """Apply parallel_tool to every plain function in a tool list (toolsets are passed through)."""
+    return [
+        parallel_tool(tool, timeout) if inspect.isfunction(tool) else tool
+        for tool in tools
+    ]
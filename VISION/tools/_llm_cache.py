@@ -0,0 +1,251 @@
+# VISION/tools/_llm_cache.py
+from typing import Dict, Any, Optional, List, TYPE_CHECKING
+import hashlib
+import os
+import threading
+import time
+import orjson
+
+if TYPE_CHECKING:
+    import numpy as np
+
+"""
+LLM Response Cache for ADK Tools
+Stores results of deterministic model calls on disk, keyed by a hash of
+(input file bytes, prompt, model name). Enabled with VISION_LLM_CACHE=1.
+A semantic layer (VISION_SEMCACHE=1) also matches differently worded prompts
+about the same file by embedding similarity (numpy is only imported when it is used).
+"""
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "vision")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def is_enabled() -> bool:
+    """Check whether LLM response caching is turned on."""
+    return os.getenv('VISION_LLM_CACHE') == '1'
+
+
+def is_semantic_enabled() -> bool:
+    """Check whether semantic (embedding similarity) caching is turned on."""
+    return os.getenv('VISION_SEMCACHE') == '1'
+
+
+def semantic_threshold() -> float:
+    """Minimum cosine similarity for a semantic cache hit."""
+    return float(os.getenv('VISION_SEMCACHE_THRESHOLD', '0.92'))
+
+
+def file_digest(file_path: str) -> str:
+    """
+    Hash a file by content.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        str: Hex SHA-256 of the file bytes
+    """
+    with open(file_path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            # Python 3.11+: the read loop runs in C straight into OpenSSL
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        h = hashlib.sha256()
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            h.update(chunk)
+        return h.hexdigest()
+
+
+def make_key(content_digest: str, prompt: str, model_name: str) -> str:
+    """
+    Build a cache key for a model call over a file.
+
+    Args:
+        content_digest: file_digest() of the input file
+        prompt: The prompt sent with the file
+        model_name: Name of the model that answers
+
+    Returns:
+        str: Hex SHA-256 key
+    """
+    h = hashlib.sha256(content_digest.encode('ascii'))
+    # NUL separators keep (prompt, model) boundaries unambiguous
+    h.update(b"\0")
+    h.update(prompt.encode('utf-8'))
+    h.update(b"\0")
+    h.update(model_name.encode('utf-8'))
+    return h.hexdigest()
+
+
+class FileCache:
+    """JSON-file cache, one file per key under cache_dir."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for key, or None on a miss."""
+        try:
+            with open(self._path(key), 'rb') as f:
+                value = orjson.loads(f.read())
+        except (OSError, ValueError):
+            # Missing or corrupt entries are both misses
+            with self._lock:
+                self._misses += 1
+            return None
+
+        with self._lock:
+            self._hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store value under key (written atomically, so readers never see partial JSON)."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(value))
+            os.replace(tmp_path, path)
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+
+        with self._lock:
+            self._writes += 1
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "writes": self._writes,
+                "hit_rate": self._hits / lookups if lookups else 0.0
+            }
+
+
+class SemanticCache:
+    """
+    Per-file cache of (prompt embedding, result) pairs.
+
+    Each scope (file digest + model) is stored as a .npy matrix of unit-length
+    embeddings plus a .json list of results, so a lookup is one np.load and one
+    matrix-vector product. Entries are evicted least-recently-hit first.
+    """
+
+    def __init__(self, cache_dir: str = os.path.join(CACHE_DIR, "semantic"), max_entries: int = 64):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _paths(self, content_digest: str, model_name: str) -> tuple[str, str]:
+        base = os.path.join(self.cache_dir, f"{content_digest}-{model_name}")
+        return f"{base}.npy", f"{base}.json"
+
+    def _load(self, content_digest: str, model_name: str) -> tuple[Optional["np.ndarray"], List[Dict[str, Any]]]:
+        import numpy as np
+        npy_path, json_path = self._paths(content_digest, model_name)
+        try:
+            vectors = np.load(npy_path)
+            with open(json_path, 'rb') as f:
+                entries = orjson.loads(f.read())
+        except (OSError, ValueError):
+            return None, []
+        if len(vectors) != len(entries):
+            # Out of sync (e.g. interrupted write), treat as empty
+            return None, []
+        return vectors, entries
+
+    def _save(self, content_digest: str, model_name: str, vectors: "np.ndarray", entries: List[Dict[str, Any]]) -> None:
+        import numpy as np
+        os.makedirs(self.cache_dir, exist_ok=True)
+        npy_path, json_path = self._paths(content_digest, model_name)
+        np.save(npy_path, vectors)
+        with open(json_path, 'wb') as f:
+            f.write(orjson.dumps(entries))
+
+    @staticmethod
+    def _normalize(embedding) -> "np.ndarray":
+        import numpy as np
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, content_digest: str, model_name: str, embedding, threshold: float) -> Optional[Dict[str, Any]]:
+        """
+        Find the cached result whose prompt embedding is most similar to embedding.
+
+        Args:
+            content_digest: file_digest() of the input file
+            model_name: Name of the model that produced the results
+            embedding: Embedding of the new prompt
+            threshold: Minimum cosine similarity for a hit
+
+        Returns:
+            dict: The cached result with its similarity score, or None on a miss
+        """
+        import numpy as np
+        query = self._normalize(embedding)
+        with self._lock:
+            vectors, entries = self._load(content_digest, model_name)
+            # Embeddings of another dimension (e.g. after a model change) can't match
+            if vectors is not None and len(entries) and vectors.shape[1] == query.shape[0]:
+                scores = vectors @ query
+                best = int(np.argmax(scores))
+                if scores[best] >= threshold:
+                    entries[best]["last_hit"] = time.time()
+                    try:
+                        self._save(content_digest, model_name, vectors, entries)
+                    except OSError:
+                        pass
+                    self._hits += 1
+                    return {"value": entries[best]["value"], "similarity": float(scores[best])}
+            self._misses += 1
+            return None
+
+    def add(self, content_digest: str, model_name: str, embedding, value: Dict[str, Any]) -> None:
+        """Store a result under the prompt embedding, evicting the least recently hit entry when full."""
+        import numpy as np
+        vector = self._normalize(embedding)
+        with self._lock:
+            vectors, entries = self._load(content_digest, model_name)
+            if vectors is None or vectors.shape[1] != len(vector):
+                # Empty scope, or entries from an embedding model of another dimension
+                vectors, entries = np.empty((0, len(vector)), dtype=np.float32), []
+            if len(entries) >= self.max_entries:
+                oldest = min(range(len(entries)), key=lambda i: entries[i]["last_hit"])
+                vectors = np.delete(vectors, oldest, axis=0)
+                del entries[oldest]
+            vectors = np.vstack([vectors, vector[np.newaxis, :]])
+            entries.append({"value": value, "last_hit": time.time()})
+            self._save(content_digest, model_name, vectors, entries)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0
+            }
+
+
+# Shared instances used by the tools
+cache = FileCache()
+semantic_cache = SemanticCache()
@@ -1,8 +1,18 @@
 # VISION/tools/fileEditor.py
 from google.adk.tools.tool_context import ToolContext
 from typing import Dict, Any, Optional, List
+import asyncio
+import errno
+import aiofiles
+import aiofiles.os
+import orjson
 import os
-import json
+import shutil
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from operator import itemgetter
 from pathlib import Path
 
 """
@@ -12,6 +22,34 @@ Provides read/write access to local repository files.
 
 # Get the repository root (parent of VISION folder)
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Resolved once, REPO_ROOT doesn't move while the agent is running
+_REPO_REAL = os.path.realpath(REPO_ROOT)
+
+# Large-block I/O: 1 MiB of buffering underneath 64 KiB chunks
+READ_BUFFER_SIZE = 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+WRITE_BUFFER_SIZE = 1024 * 1024
+WRITE_CHUNK_SIZE = 64 * 1024
+# Windows can't rename over a file another handle has open (e.g. a concurrent read_file),
+# retry the rename this many times before falling back to an in-place write
+REPLACE_RETRIES = 5
+REPLACE_RETRY_DELAY = 0.05
+_IS_WINDOWS = os.name == 'nt'
+
+# Threads for recursive listings, bound by syscall latency rather than cores
+LIST_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Short-lived cache of directory listings: (abs_path, dir mtime_ns, include_hidden, recursive) -> (stored_at, contents)
+# Entries are dropped after LIST_CACHE_TTL seconds or when a tool modifies something under the directory
+LIST_CACHE_TTL = 2.0
+_LIST_CACHE: Dict[tuple, tuple[float, tuple[Dict[str, Any], ...]]] = {}
+
+# Extensions that are never worth a UTF-8 decode attempt
+_BINARY_EXTS = frozenset({
+    '.mp4', '.mov', '.mkv', '.webm', '.mp3', '.m4a', '.wav',
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico', '.pdf',
+    '.zip', '.tar', '.gz', '.7z', '.pyc', '.so', '.dll', '.exe', '.wasm', '.bin'
+})
 
 def _is_safe_path(file_path: str) -> tuple[bool, str]:
     """
@@ -27,10 +65,9 @@ def _is_safe_path(file_path: str) -> tuple[bool, str]:
         # Convert to absolute path and resolve any .. or symbolic links
         abs_path = os.path.abspath(os.path.join(REPO_ROOT, file_path))
         real_path = os.path.realpath(abs_path)
-        real_repo = os.path.realpath(REPO_ROOT)
         
-        # Check if the path is within repository bounds
-        if not real_path.startswith(real_repo):
+        # Check if the path is within repository bounds (component-wise, so /repo_evil != /repo)
+        if not Path(real_path).is_relative_to(_REPO_REAL):
             return False, ""
         
         return True, real_path
@@ -38,21 +75,58 @@ def _is_safe_path(file_path: str) -> tuple[bool, str]:
         return False, ""
 
 
-def read_file(
+def _read_bytes(abs_path: str, offset: int = 0, max_bytes: Optional[int] = None) -> bytearray:
+    """
+    Read a byte range of a file in large blocks (blocking, meant to run in a worker thread).
+    
+    Args:
+        abs_path: Absolute path of the file to read
+        offset: Byte offset to start reading from
+        max_bytes: Maximum number of bytes to read (None reads to the end)
+        
+    Returns:
+        bytearray: The bytes read
+    """
+    buf = bytearray()
+    with open(abs_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        f.seek(offset)
+        while True:
+            chunk_size = READ_CHUNK_SIZE if max_bytes is None else min(READ_CHUNK_SIZE, max_bytes - len(buf))
+            data = f.read(chunk_size)
+            if not data:
+                break
+            buf.extend(data)
+    return buf
+
+
+async def read_file(
     file_path: str,
+    offset: int = 0,
+    max_bytes: Optional[int] = None,
     tool_context: ToolContext = None
 ) -> Dict[str, Any]:
     """
     Read the contents of a file in the repository.
+    Large files can be paged through with offset and max_bytes.
+    Whole .json files are returned parsed; known binary formats are not read.
 
     Args:
         file_path: Relative path to the file from repository root
+        offset: Byte offset to start reading from (default: 0)
+        max_bytes: Maximum number of bytes to read (default: whole file)
         tool_context: Tool context (optional for session actions)
 
     Returns:
-        Dict with file contents, encoding info, and status
+        Dict with file contents, encoding info, status, and truncated/next_offset for paging
     """
     try:
+        if offset < 0 or (max_bytes is not None and max_bytes <= 0):
+            return {
+                "success": False,
+                "error": "offset must be >= 0 and max_bytes must be > 0",
+                "content": None
+            }
+        
         is_safe, abs_path = _is_safe_path(file_path)
         
         if not is_safe:
@@ -62,33 +136,97 @@ def read_file(
                 "content": None
             }
         
-        if not os.path.exists(abs_path):
+        if not await aiofiles.os.path.exists(abs_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}",
                 "content": None
             }
         
-        if not os.path.isfile(abs_path):
+        if not await aiofiles.os.path.isfile(abs_path):
             return {
                 "success": False,
                 "error": f"Not a file: {file_path}",
                 "content": None
             }
         
-        # Try to read as text first
-        try:
-            with open(abs_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            encoding = 'utf-8'
-        except UnicodeDecodeError:
-            # If not text, read as binary
-            with open(abs_path, 'rb') as f:
-                content = f.read()
-            encoding = 'binary'
-            content = f"<binary file, {len(content)} bytes>"
-        
-        file_size = os.path.getsize(abs_path)
+        file_size = await aiofiles.os.path.getsize(abs_path)
+        if offset > file_size:
+            return {
+                "success": False,
+                "error": f"offset {offset} is past the end of the file ({file_size} bytes)",
+                "content": None
+            }
+        
+        ext = os.path.splitext(abs_path)[1].lower()
+        
+        if ext in _BINARY_EXTS:
+            # Known binary format, don't read or decode it
+            return {
+                "success": True,
+                "content": f"<binary file, {file_size} bytes>",
+                "file_path": file_path,
+                "absolute_path": abs_path,
+                "encoding": "binary",
+                "size_bytes": file_size,
+                "truncated": False,
+                "next_offset": file_size,
+                "message": f"Successfully read file: {file_path}"
+            }
+        
+        buf = await asyncio.to_thread(_read_bytes, abs_path, offset, max_bytes)
+        next_offset = offset + len(buf)
+        truncated = next_offset < file_size
+        
+        # Tracked separately from content, a JSON file holding `null` parses to None
+        parsed = False
+        if ext == '.json' and offset == 0 and not truncated:
+            # Whole JSON file, hand back the parsed structure instead of a string
+            try:
+                content = orjson.loads(buf)
+                encoding = 'json'
+                parsed = True
+            except orjson.JSONDecodeError:
+                # Not valid JSON, fall through to the text path
+                pass
+        
+        if not parsed:
+            # An offset inside a multi-byte character starts on continuation bytes, skip them
+            start = 0
+            if offset > 0:
+                while start < min(len(buf), 3) and 0x80 <= buf[start] < 0xC0:
+                    start += 1
+            
+            # Try to decode as text first
+            try:
+                content = buf[start:].decode('utf-8')
+                encoding = 'utf-8'
+            except UnicodeDecodeError as e:
+                content = None
+                if truncated and e.reason == 'unexpected end of data':
+                    end = start + e.start
+                    if end == start:
+                        # max_bytes is smaller than the first character, read through to its end
+                        lead = buf[start]
+                        char_len = 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+                        buf.extend(await asyncio.to_thread(
+                            _read_bytes, abs_path, next_offset, char_len - (len(buf) - start)
+                        ))
+                        end = len(buf)
+                    # The page ended inside a multi-byte character, resume from its first byte
+                    del buf[end:]
+                    next_offset = offset + len(buf)
+                    truncated = next_offset < file_size
+                    try:
+                        content = buf[start:].decode('utf-8')
+                        encoding = 'utf-8'
+                    except UnicodeDecodeError:
+                        pass
+                
+                if content is None:
+                    # If not text, report as binary
+                    encoding = 'binary'
+                    content = f"<binary file, {file_size} bytes>"
         
         return {
             "success": True,
@@ -97,6 +235,8 @@ def read_file(
             "absolute_path": abs_path,
             "encoding": encoding,
             "size_bytes": file_size,
+            "truncated": truncated,
+            "next_offset": next_offset,
             "message": f"Successfully read file: {file_path}"
         }
         
@@ -108,7 +248,101 @@ def read_file(
         }
 
 
-def write_file(
+def _replace_file(src: str, dst: str) -> bool:
+    """
+    Rename src over dst. On Windows the rename fails with PermissionError while
+    any other handle has dst open, so it is retried briefly there.
+    
+    Returns:
+        bool: True if renamed, False if dst stayed locked (Windows only)
+    """
+    for attempt in range(REPLACE_RETRIES):
+        try:
+            os.replace(src, dst)
+            return True
+        except PermissionError:
+            if not _IS_WINDOWS:
+                raise
+            time.sleep(REPLACE_RETRY_DELAY)
+    return False
+
+
+def _write_text_atomic(abs_path: str, content: str, existed: bool) -> int:
+    """
+    Write text to a temp file next to the target and rename it into place
+    (blocking, meant to run in a worker thread). Readers never see a half-written file.
+    
+    Args:
+        abs_path: Absolute path of the file to write
+        content: Text content to write
+        existed: Whether the target already exists (its permissions are kept)
+        
+    Returns:
+        int: Size of the written file in bytes
+    """
+    if existed and not os.access(abs_path, os.W_OK):
+        # os.replace only needs directory permissions, keep refusing read-only targets
+        # with the same error a direct open(abs_path, 'w') would raise
+        raise PermissionError(errno.EACCES, os.strerror(errno.EACCES), abs_path)
+    
+    # Unique per thread, so concurrent writes to the same file don't share a temp file
+    tmp_path = f"{abs_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            # Encode in chunks instead of materializing one huge encoded copy
+            f.writelines(
+                content[i:i + WRITE_CHUNK_SIZE] for i in range(0, len(content), WRITE_CHUNK_SIZE)
+            )
+            f.flush()
+            file_size = os.fstat(f.fileno()).st_size
+        
+        if existed:
+            shutil.copymode(abs_path, tmp_path)
+        if not _replace_file(tmp_path, abs_path):
+            # Target is held open by another handle (Windows), write it in place like
+            # open(abs_path, 'w') did before; not atomic, but the write still succeeds
+            shutil.copyfile(tmp_path, abs_path)
+        return file_size
+    finally:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+async def read_files(
+    paths: List[str],
+    max_bytes_each: int = 65536,
+    tool_context: ToolContext = None
+) -> Dict[str, Any]:
+    """
+    Read several files in the repository in one call (reads run concurrently).
+    Prefer this over multiple read_file calls when more than one file is needed.
+
+    Args:
+        paths: Relative paths to the files from repository root
+        max_bytes_each: Maximum number of bytes to read per file (default: 65536)
+        tool_context: Tool context (optional for session actions)
+
+    Returns:
+        Dict with one read_file result per path, in the same order as paths
+    """
+    # read_file reports failures in its result dict, so one bad path doesn't affect the others
+    results = await asyncio.gather(*(
+        read_file(path, max_bytes=max_bytes_each) for path in paths
+    ))
+    failed = sum(1 for result in results if not result["success"])
+    
+    return {
+        "success": failed == 0,
+        "results": list(results),
+        "count": len(results),
+        "failed": failed,
+        "message": f"Read {len(results) - failed} of {len(results)} files"
+    }
+
+
+async def write_file(
     file_path: str,
     content: str,
     create_dirs: bool = True,
@@ -137,9 +371,9 @@ def write_file(
         
         # Create parent directories if needed
         parent_dir = os.path.dirname(abs_path)
-        if not os.path.exists(parent_dir):
+        if not await aiofiles.os.path.exists(parent_dir):
             if create_dirs:
-                os.makedirs(parent_dir, exist_ok=True)
+                await aiofiles.os.makedirs(parent_dir, exist_ok=True)
             else:
                 return {
                     "success": False,
@@ -147,13 +381,11 @@ def write_file(
                 }
         
         # Check if file exists (for info)
-        existed = os.path.exists(abs_path)
+        existed = await aiofiles.os.path.exists(abs_path)
         
         # Write the file
-        with open(abs_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        file_size = os.path.getsize(abs_path)
+        file_size = await asyncio.to_thread(_write_text_atomic, abs_path, content, existed)
+        _invalidate_listings(abs_path)
         action = "Updated" if existed else "Created"
         
         return {
@@ -172,7 +404,7 @@ def write_file(
         }
 
 
-def delete_file(
+async def delete_file(
     file_path: str,
     tool_context: ToolContext = None
 ) -> Dict[str, Any]:
@@ -195,20 +427,21 @@ def delete_file(
                 "error": f"Access denied: Path '{file_path}' is outside repository bounds"
             }
         
-        if not os.path.exists(abs_path):
+        if not await aiofiles.os.path.exists(abs_path):
             return {
                 "success": False,
                 "error": f"File not found: {file_path}"
             }
         
-        if not os.path.isfile(abs_path):
+        if not await aiofiles.os.path.isfile(abs_path):
             return {
                 "success": False,
                 "error": f"Not a file: {file_path}"
             }
         
         # Delete the file
-        os.remove(abs_path)
+        await aiofiles.os.remove(abs_path)
+        _invalidate_listings(abs_path)
         
         return {
             "success": True,
@@ -223,7 +456,141 @@ def delete_file(
         }
 
 
-def list_directory(
+def _invalidate_listings(abs_path: str) -> None:
+    """Drop cached listings of abs_path and of every directory containing it."""
+    for key in list(_LIST_CACHE):
+        cached_dir = key[0]
+        if abs_path == cached_dir or abs_path.startswith(cached_dir.rstrip(os.sep) + os.sep):
+            _LIST_CACHE.pop(key, None)
+
+
+def _entry_size(entry: os.DirEntry) -> int:
+    """Size of a scandir entry in bytes (0 if it can't be stat'ed)."""
+    try:
+        return entry.stat().st_size
+    except OSError:
+        return 0
+
+
+def _scan_dir(path: str, include_hidden: bool) -> Optional[tuple[list, list]]:
+    """
+    List one directory with a single os.scandir pass (runs in a worker thread).
+    
+    Args:
+        path: Absolute path of the directory to scan
+        include_hidden: Include hidden files/directories (starting with .)
+        
+    Returns:
+        tuple: (dirs: list of DirEntry, files: list of (name, size_bytes)), or None if unreadable
+    """
+    dirs = []
+    files = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if not include_hidden and entry.name[0] == '.':
+                    continue
+                if entry.is_dir():
+                    dirs.append(entry)
+                else:
+                    files.append((entry.name, _entry_size(entry)))
+    except OSError:
+        # Unreadable directories are skipped, same as os.walk
+        return None
+    return dirs, files
+
+
+def _walk(path: str, include_hidden: bool):
+    """
+    Walk a directory tree like os.walk, scanning directories concurrently on a
+    thread pool (the walk is bound by syscall latency, not CPU), then yielding
+    the results in the same top-down order as a sequential walk.
+    
+    Args:
+        path: Absolute path of the directory to walk
+        include_hidden: Include hidden files/directories (starting with .)
+        
+    Yields:
+        tuple: (dir_path: str, dirs: list of DirEntry, files: list of (name, size_bytes))
+    """
+    scanned = {}
+    with ThreadPoolExecutor(max_workers=LIST_MAX_WORKERS) as executor:
+        pending = {executor.submit(_scan_dir, path, include_hidden): path}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                dir_path = pending.pop(future)
+                result = future.result()
+                scanned[dir_path] = result
+                if result is None:
+                    continue
+                for entry in result[0]:
+                    # Like os.walk, don't descend into symlinked directories
+                    if not entry.is_symlink():
+                        pending[executor.submit(_scan_dir, entry.path, include_hidden)] = entry.path
+    
+    stack = [path]
+    while stack:
+        dir_path = stack.pop()
+        result = scanned.get(dir_path)
+        if result is None:
+            continue
+        dirs, files = result
+        yield dir_path, dirs, files
+        stack.extend(entry.path for entry in reversed(dirs) if not entry.is_symlink())
+
+
+def _list_contents(abs_path: str, include_hidden: bool, recursive: bool) -> List[Dict[str, Any]]:
+    """
+    Collect directory entries (blocking, meant to run in a worker thread).
+    
+    Args:
+        abs_path: Absolute path of the directory to list
+        include_hidden: Include hidden files/directories (starting with .)
+        recursive: List subdirectories recursively
+        
+    Returns:
+        list: Entry dicts with name, path, type and size_bytes for files
+    """
+    contents = []
+    # Hot loop on large trees: pre-bind lookups and build paths by concatenation
+    # (relpath is computed once per directory, not per entry)
+    append = contents.append
+    sep = os.sep
+    
+    if recursive:
+        # Recursive listing
+        for root, dirs, files in _walk(abs_path, include_hidden):
+            prefix = os.path.relpath(root, REPO_ROOT) + sep
+            
+            for entry in dirs:
+                name = entry.name
+                append({"name": name, "path": prefix + name, "type": "directory"})
+            
+            for name, size in files:
+                append({"name": name, "path": prefix + name, "type": "file", "size_bytes": size})
+    else:
+        # Non-recursive listing, a single scandir pass
+        rel_root = os.path.relpath(abs_path, REPO_ROOT)
+        prefix = "" if rel_root == os.curdir else rel_root + sep
+        
+        with os.scandir(abs_path) as it:
+            for entry in it:
+                name = entry.name
+                if not include_hidden and name[0] == '.':
+                    continue
+                
+                if entry.is_dir():
+                    append({"name": name, "path": prefix + name, "type": "directory"})
+                else:
+                    append({"name": name, "path": prefix + name, "type": "file", "size_bytes": _entry_size(entry)})
+        
+        contents.sort(key=itemgetter("name"))
+    
+    return contents
+
+
+async def list_directory(
     dir_path: str = ".",
     include_hidden: bool = False,
     recursive: bool = False,
@@ -251,83 +618,37 @@ def list_directory(
                 "contents": []
             }
         
-        if not os.path.exists(abs_path):
+        if not await aiofiles.os.path.exists(abs_path):
             return {
                 "success": False,
                 "error": f"Directory not found: {dir_path}",
                 "contents": []
             }
         
-        if not os.path.isdir(abs_path):
+        if not await aiofiles.os.path.isdir(abs_path):
             return {
                 "success": False,
                 "error": f"Not a directory: {dir_path}",
                 "contents": []
             }
         
-        contents = []
+        # Repeated listings of an unchanged directory are served from the cache
+        dir_stat = await aiofiles.os.stat(abs_path)
+        cache_key = (abs_path, dir_stat.st_mtime_ns, include_hidden, recursive)
+        now = time.monotonic()
+        cached = _LIST_CACHE.get(cache_key)
         
-        if recursive:
-            # Recursive listing
-            for root, dirs, files in os.walk(abs_path):
-                # Filter hidden items if needed
-                if not include_hidden:
-                    dirs[:] = [d for d in dirs if not d.startswith('.')]
-                    files = [f for f in files if not f.startswith('.')]
-                
-                rel_root = os.path.relpath(root, REPO_ROOT)
-                
-                for name in dirs:
-                    rel_path = os.path.join(rel_root, name)
-                    contents.append({
-                        "name": name,
-                        "path": rel_path,
-                        "type": "directory"
-                    })
-                
-                for name in files:
-                    rel_path = os.path.join(rel_root, name)
-                    full_path = os.path.join(root, name)
-                    try:
-                        size = os.path.getsize(full_path)
-                    except:
-                        size = 0
-                    
-                    contents.append({
-                        "name": name,
-                        "path": rel_path,
-                        "type": "file",
-                        "size_bytes": size
-                    })
+        if cached and now - cached[0] < LIST_CACHE_TTL:
+            # Hand out copies, callers mutating the result must not change the cached listing
+            contents = [dict(entry) for entry in cached[1]]
         else:
-            # Non-recursive listing
-            items = os.listdir(abs_path)
-            
-            if not include_hidden:
-                items = [item for item in items if not item.startswith('.')]
+            # Directory walking is a burst of blocking syscalls, run it off the event loop
+            contents = await asyncio.to_thread(_list_contents, abs_path, include_hidden, recursive)
             
-            for item in sorted(items):
-                item_path = os.path.join(abs_path, item)
-                rel_path = os.path.relpath(item_path, REPO_ROOT)
-                
-                if os.path.isdir(item_path):
-                    contents.append({
-                        "name": item,
-                        "path": rel_path,
-                        "type": "directory"
-                    })
-                else:
-                    try:
-                        size = os.path.getsize(item_path)
-                    except:
-                        size = 0
-                    
-                    contents.append({
-                        "name": item,
-                        "path": rel_path,
-                        "type": "file",
-                        "size_bytes": size
-                    })
+            # Expired entries are dropped whenever a new listing is stored
+            for key in [key for key, (stored_at, _) in _LIST_CACHE.items() if now - stored_at >= LIST_CACHE_TTL]:
+                _LIST_CACHE.pop(key, None)
+            _LIST_CACHE[cache_key] = (now, tuple(dict(entry) for entry in contents))
         
         return {
             "success": True,
@@ -346,7 +667,7 @@ def list_directory(
         }
 
 
-def create_directory(
+async def create_directory(
     dir_path: str,
     tool_context: ToolContext = None
 ) -> Dict[str, Any]:
@@ -369,14 +690,15 @@ def create_directory(
                 "error": f"Access denied: Path '{dir_path}' is outside repository bounds"
             }
         
-        if os.path.exists(abs_path):
+        if await aiofiles.os.path.exists(abs_path):
             return {
                 "success": False,
                 "error": f"Path already exists: {dir_path}"
             }
         
         # Create the directory (and any parent directories)
-        os.makedirs(abs_path, exist_ok=True)
+        await aiofiles.os.makedirs(abs_path, exist_ok=True)
+        _invalidate_listings(abs_path)
         
         return {
             "success": True,
@@ -392,7 +714,7 @@ def create_directory(
         }
 
 
-def get_file_info(
+async def get_file_info(
     file_path: str,
     tool_context: ToolContext = None
 ) -> Dict[str, Any]:
@@ -415,16 +737,16 @@ def get_file_info(
                 "error": f"Access denied: Path '{file_path}' is outside repository bounds"
             }
         
-        if not os.path.exists(abs_path):
+        if not await aiofiles.os.path.exists(abs_path):
             return {
                 "success": False,
                 "error": f"Path not found: {file_path}",
                 "exists": False
             }
         
-        stat_info = os.stat(abs_path)
-        is_file = os.path.isfile(abs_path)
-        is_dir = os.path.isdir(abs_path)
+        stat_info = await aiofiles.os.stat(abs_path)
+        is_file = stat.S_ISREG(stat_info.st_mode)
+        is_dir = stat.S_ISDIR(stat_info.st_mode)
         
         info = {
             "success": True,
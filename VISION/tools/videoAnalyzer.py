@@ -1,20 +1,26 @@
 # VISION/tools/videoAnalyzer.py
 from google.adk.tools.tool_context import ToolContext
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, TYPE_CHECKING
+import asyncio
+import functools
 import os
 import tempfile
+import threading
 import base64
 from pathlib import Path
 
-# Google Cloud imports
-from google.cloud import speech_v1p1beta1 as speech
-from google.cloud import storage
-import vertexai
-from vertexai.generative_models import GenerativeModel, Part
+# Google Cloud SDKs (vertexai, google.cloud.storage) are imported on first use,
+# they pull in gRPC/protobuf/auth and aren't needed by sessions that never analyze a video
 import mimetypes
 
+if TYPE_CHECKING:
+    from google.cloud import storage
+    from vertexai.generative_models import GenerativeModel, Part
+    from vertexai.language_models import TextEmbeddingModel
+
 # Import existing YouTube downloader
 from .youtubeDownloader import _download_video_internal
+from . import _llm_cache
 
 """
 Video Analyzer Tool for ADK Agent
@@ -25,6 +31,131 @@ Uses Google Vertex AI for Speech-to-Text and Gemini for visual analysis.
 # Get the repository root
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Gemini model used for video understanding
+GEMINI_VIDEO_MODEL = "gemini-2.0-flash-exp"
+
+# Embedding model for the semantic prompt cache
+PROMPT_EMBEDDING_MODEL = "text-embedding-004"
+
+# Gemini expects audio/mp4 for .m4a, which isn't in every platform's mimetypes table
+mimetypes.add_type("audio/mp4", ".m4a")
+
+# Prompts for the split transcript / visual analyses
+TRANSCRIPT_ANALYSIS_PROMPT = """Transcribe all spoken words in this video. Provide:
+
+1. FULL TRANSCRIPT: Complete word-for-word transcription with timestamps
+2. SPEAKERS: Identify different speakers if multiple people speak
+3. KEY TOPICS: Main topics discussed
+4. SUMMARY: Brief summary of what was said
+
+Format the transcript clearly with timestamps."""
+
+VISUAL_ANALYSIS_PROMPT = """Analyze the visual content of this video. Provide:
+
+1. SCENE BREAKDOWN: Describe each major scene or segment
+2. VISUAL ELEMENTS: Key visual elements, objects, people, settings
+3. ACTIONS: What actions and events occur
+4. TEXT ON SCREEN: Any text, captions, or graphics shown
+5. VISUAL STYLE: Cinematography, editing style, visual quality
+6. KEY FRAMES: Describe important moments or frames
+7. OVERALL NARRATIVE: Visual story being told
+
+Focus only on what can be seen, not audio content."""
+
+# Prefix and resumable-upload chunk size for videos staged in GCS (VISION_GCS_BUCKET)
+GCS_VIDEO_PREFIX = "vision-video-cache"
+GCS_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Height cap for YouTube downloads used only for visual analysis; Gemini samples
+# frames at low resolution anyway, so higher resolutions just cost download time
+VISUAL_MAX_HEIGHT = 720
+
+
+@functools.lru_cache(maxsize=1)
+def _gcs_client() -> "storage.Client":
+    """Create the Cloud Storage client once per process."""
+    from google.cloud import storage
+    return storage.Client(project=os.getenv('GOOGLE_CLOUD_PROJECT'))
+
+
+@functools.lru_cache(maxsize=4)
+def _gemini_model(project_id: str, location: str) -> "GenerativeModel":
+    """Initialize Vertex AI and create the Gemini model once per project/location."""
+    import vertexai
+    from vertexai.generative_models import GenerativeModel
+    vertexai.init(project=project_id, location=location)
+    return GenerativeModel(GEMINI_VIDEO_MODEL)
+
+
+@functools.lru_cache(maxsize=1)
+def _embedding_model() -> "TextEmbeddingModel":
+    """Load the prompt embedding model once per process (after Vertex AI is initialized)."""
+    from vertexai.language_models import TextEmbeddingModel
+    return TextEmbeddingModel.from_pretrained(PROMPT_EMBEDDING_MODEL)
+
+
+def _embed_prompt(prompt: str) -> List[float]:
+    """Embed an analysis prompt for semantic cache lookups."""
+    return _embedding_model().get_embeddings([prompt])[0].values
+
+
+def _media_mime_type(media_path: str) -> str:
+    """MIME type of a downloaded/local media file (defaults to video/mp4)."""
+    mime_type, _ = mimetypes.guess_type(media_path)
+    return mime_type or "video/mp4"
+
+
+def _inline_video_part(video_path: str, mime_type: str = "video/mp4") -> "Part":
+    """
+    Build a Part carrying the video bytes inline.
+    The request proto keeps its own copy of the bytes, so the file buffer is read
+    in this helper and released as soon as it returns instead of staying alive
+    next to the proto for the whole (slow) generate_content call.
+    
+    Args:
+        video_path: Path to the video file
+        mime_type: MIME type of the file
+        
+    Returns:
+        Part: Inline video part
+    """
+    from vertexai.generative_models import Part
+    
+    # Read video file
+    with open(video_path, 'rb') as f:
+        video_data = f.read()
+    
+    # Create video part
+    return Part.from_data(
+        data=video_data,
+        mime_type=mime_type
+    )
+
+
+def _upload_video_to_gcs(video_path: str, bucket_name: str, video_digest: str, mime_type: str = "video/mp4") -> str:
+    """
+    Upload a video to Cloud Storage so Gemini can read it by URI.
+    Blobs are keyed by content, so re-analyzing the same video skips the upload.
+    
+    Args:
+        video_path: Path to the video file
+        bucket_name: Name of the GCS bucket to stage videos in
+        video_digest: SHA-256 of the video bytes
+        mime_type: MIME type of the file
+        
+    Returns:
+        str: gs:// URI of the uploaded video
+    """
+    extension = os.path.splitext(video_path)[1] or ".mp4"
+    blob_name = f"{GCS_VIDEO_PREFIX}/{video_digest}{extension}"
+    
+    blob = _gcs_client().bucket(bucket_name).blob(blob_name, chunk_size=GCS_CHUNK_SIZE)
+    if not blob.exists():
+        print(f"Uploading video to gs://{bucket_name}/{blob_name}")
+        blob.upload_from_filename(video_path, content_type=mime_type)
+    
+    return f"gs://{bucket_name}/{blob_name}"
+
 
 def _extract_audio_transcript(video_path: str, language_code: str = "en-US") -> tuple[bool, str, str]:
     """
@@ -45,21 +176,87 @@ def _extract_audio_transcript(video_path: str, language_code: str = "en-US") ->
         return False, None, str(e)
 
 
-def _analyze_video_with_gemini(
-    video_path: str,
+DEFAULT_ANALYSIS_PROMPT = """Analyze this video comprehensively and provide:
+
+1. TRANSCRIPT: Full transcript of all spoken words and audio content
+2. VISUAL SUMMARY: Describe the key visual elements, scenes, and actions
+3. KEY MOMENTS: Identify important timestamps and what happens at each
+4. TOPICS: Main topics and themes discussed or shown
+5. PEOPLE: Describe any people visible (appearance, actions, roles)
+6. TEXT: Any visible text, captions, or written content
+7. OBJECTS: Important objects, products, or items shown
+8. SETTING: Environment, location, and context
+9. MOOD/TONE: Overall atmosphere and emotional tone
+10. INSIGHTS: Key takeaways, insights, or conclusions
+
+Provide detailed, structured output."""
+
+
+class _PreparedVideo:
+    """
+    Per-video state shared by every Gemini call on the same file.
+    The file is hashed once on construction; the request Part (GCS upload or
+    inline bytes) is built on first use, so concurrent analyses of one video
+    never upload it twice or hold two copies of its bytes.
+    """
+
+    def __init__(self, video_path: str):
+        self.path = video_path
+        self.mime_type = _media_mime_type(video_path)
+        self.bucket_name = os.getenv('VISION_GCS_BUCKET')
+        
+        # Hash the video once, shared by both caches and the GCS blob name
+        self.digest = None
+        if _llm_cache.is_enabled() or _llm_cache.is_semantic_enabled() or self.bucket_name:
+            self.digest = _llm_cache.file_digest(video_path)
+        
+        self._part = None
+        self._lock = threading.Lock()
+
+    def part(self) -> "Part":
+        """Video Part for a generate_content request (built once, then reused)."""
+        with self._lock:
+            if self._part is None:
+                if self.bucket_name:
+                    from vertexai.generative_models import Part
+                    # Reference the video by URI instead of inlining the bytes in the request
+                    self._part = Part.from_uri(
+                        uri=_upload_video_to_gcs(self.path, self.bucket_name, self.digest, self.mime_type),
+                        mime_type=self.mime_type
+                    )
+                else:
+                    self._part = _inline_video_part(self.path, self.mime_type)
+            return self._part
+
+
+def _generate_video_analysis(
+    video: _PreparedVideo,
     analysis_prompt: str = None
 ) -> tuple[bool, Dict[str, Any], str]:
     """
-    Analyze video content using Gemini multimodal model.
+    Analyze a prepared video with the Gemini multimodal model.
     
     Args:
-        video_path: Path to the video file
+        video: Prepared video (hash and request Part shared across calls)
         analysis_prompt: Custom prompt for analysis
         
     Returns:
         tuple: (success: bool, analysis_result: dict, error: str)
     """
     try:
+        # Default analysis prompt if none provided
+        if not analysis_prompt:
+            analysis_prompt = DEFAULT_ANALYSIS_PROMPT
+        
+        # Identical video + prompt + model gives the same analysis, reuse it if cached
+        cache_key = None
+        if _llm_cache.is_enabled():
+            cache_key = _llm_cache.make_key(video.digest, analysis_prompt, GEMINI_VIDEO_MODEL)
+            cached = _llm_cache.cache.get(cache_key)
+            if cached is not None:
+                print("Using cached video analysis")
+                return True, {**cached, "cached": True}, None
+        
         # Initialize Vertex AI
         project_id = os.getenv('GOOGLE_CLOUD_PROJECT')
         location = os.getenv('GOOGLE_CLOUD_LOCATION', 'us-central1')
@@ -67,55 +264,83 @@ def _analyze_video_with_gemini(
         if not project_id:
             return False, None, "GOOGLE_CLOUD_PROJECT environment variable not set"
         
-        vertexai.init(project=project_id, location=location)
-        
         # Use Gemini 2.0 Flash for video understanding
-        model = GenerativeModel("gemini-2.0-flash-exp")
+        model = _gemini_model(project_id, location)
         
-        # Read video file
-        with open(video_path, 'rb') as f:
-            video_data = f.read()
+        # A differently worded prompt about the same video may already have an answer
+        prompt_embedding = None
+        if _llm_cache.is_semantic_enabled():
+            try:
+                prompt_embedding = _embed_prompt(analysis_prompt)
+            except Exception as e:
+                print(f"Warning: Could not embed prompt for semantic cache: {e}")
+            
+            match = None
+            if prompt_embedding is not None:
+                try:
+                    match = _llm_cache.semantic_cache.lookup(
+                        video.digest,
+                        GEMINI_VIDEO_MODEL,
+                        prompt_embedding,
+                        _llm_cache.semantic_threshold()
+                    )
+                except Exception as e:
+                    # e.g. stored embeddings of another dimension after a model change
+                    print(f"Warning: Semantic cache lookup failed: {e}")
+                if match is not None:
+                    print(f"Using semantically cached video analysis (similarity {match['similarity']:.3f})")
+                    return True, {**match["value"], "cached": True, "cache_similarity": match["similarity"]}, None
         
-        # Create video part
-        video_part = Part.from_data(
-            data=video_data,
-            mime_type="video/mp4"
-        )
+        from vertexai.generative_models import FinishReason
         
-        # Default analysis prompt if none provided
-        if not analysis_prompt:
-            analysis_prompt = """Analyze this video comprehensively and provide:
-
-1. TRANSCRIPT: Full transcript of all spoken words and audio content
-2. VISUAL SUMMARY: Describe the key visual elements, scenes, and actions
-3. KEY MOMENTS: Identify important timestamps and what happens at each
-4. TOPICS: Main topics and themes discussed or shown
-5. PEOPLE: Describe any people visible (appearance, actions, roles)
-6. TEXT: Any visible text, captions, or written content
-7. OBJECTS: Important objects, products, or items shown
-8. SETTING: Environment, location, and context
-9. MOOD/TONE: Overall atmosphere and emotional tone
-10. INSIGHTS: Key takeaways, insights, or conclusions
-
-Provide detailed, structured output."""
+        # Generate content, streamed so the text arrives while Gemini is still generating
+        chunks = []
+        last_chunk = None
+        for chunk in model.generate_content([video.part(), analysis_prompt], stream=True):
+            last_chunk = chunk
+            if not chunk.candidates or not chunk.candidates[0].content.parts:
+                # Chunk without text (e.g. only a finish reason), checked below
+                continue
+            chunks.append(chunk.text)
+        
+        # Only a normal finish is a complete answer; a block (SAFETY, RECITATION, ...)
+        # midway leaves partial text that must not be returned or cached
+        finish_reason = None
+        if last_chunk is not None and last_chunk.candidates:
+            finish_reason = last_chunk.candidates[0].finish_reason
+        if finish_reason not in (FinishReason.STOP, FinishReason.MAX_TOKENS):
+            reason = getattr(finish_reason, "name", None) or "no candidates, prompt likely blocked"
+            return False, None, f"Gemini stopped before finishing the analysis ({reason})"
         
-        # Generate content
-        response = model.generate_content([video_part, analysis_prompt])
+        if not chunks:
+            return False, None, "Gemini returned no text for this video"
         
         # Parse response
         analysis_result = {
-            "full_analysis": response.text,
-            "model_used": "gemini-2.0-flash-exp",
+            "full_analysis": "".join(chunks),
+            "model_used": GEMINI_VIDEO_MODEL,
             "prompt": analysis_prompt
         }
         
+        if cache_key:
+            try:
+                _llm_cache.cache.set(cache_key, analysis_result)
+            except OSError as e:
+                print(f"Warning: Could not cache video analysis: {e}")
+        
+        if prompt_embedding is not None:
+            try:
+                _llm_cache.semantic_cache.add(video.digest, GEMINI_VIDEO_MODEL, prompt_embedding, analysis_result)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not add video analysis to semantic cache: {e}")
+        
         return True, analysis_result, None
         
     except Exception as e:
         return False, None, str(e)
 
 
-def analyze_video(
+async def analyze_video(
     source: str,
     source_type: str = "auto",
     analysis_type: str = "full",
@@ -140,6 +365,11 @@ def analyze_video(
     temp_video_path = None
     cleanup_file = False
     
+    # Transcript analyses of YouTube videos only download the audio track, so the
+    # default comprehensive prompt (which asks about visuals) must not be used for them
+    if analysis_type == "transcript" and not custom_prompt:
+        custom_prompt = TRANSCRIPT_ANALYSIS_PROMPT
+    
     try:
         # Determine source type
         if source_type == "auto":
@@ -154,7 +384,13 @@ def analyze_video(
             
             # Create temp directory for download
             temp_dir = tempfile.mkdtemp()
-            success, video_path, error = _download_video_internal(source, temp_dir)
+            # Transcripts only need the (much smaller) audio track, visuals a downsampled video
+            audio_only = analysis_type == "transcript"
+            max_height = VISUAL_MAX_HEIGHT if analysis_type == "visual" else None
+            # yt-dlp blocks for the whole download, keep it off the event loop
+            success, video_path, error = await asyncio.to_thread(
+                _download_video_internal, source, temp_dir, audio_only, max_height
+            )
             
             if not success:
                 return {
@@ -201,13 +437,41 @@ def analyze_video(
         }
         
         if analysis_type in ["full", "visual", "transcript"]:
-            # Use Gemini for comprehensive analysis (includes both transcript and visuals)
-            print("Performing Gemini video analysis...")
+            # Hash the video and set up its upload/inline Part once for every Gemini call below
+            video = await asyncio.to_thread(_PreparedVideo, temp_video_path)
             
-            success, analysis, error = _analyze_video_with_gemini(
-                temp_video_path,
-                custom_prompt
-            )
+            if analysis_type == "full" and not custom_prompt:
+                # Transcript and visual analyses are independent, run both Gemini calls at once
+                print("Performing Gemini transcript and visual analyses...")
+                
+                (transcript_ok, transcript, transcript_error), (visual_ok, visual, visual_error) = await asyncio.gather(
+                    asyncio.to_thread(_generate_video_analysis, video, TRANSCRIPT_ANALYSIS_PROMPT),
+                    asyncio.to_thread(_generate_video_analysis, video, VISUAL_ANALYSIS_PROMPT)
+                )
+                
+                success = transcript_ok and visual_ok
+                error = transcript_error or visual_error
+                analysis = None
+                if success:
+                    analysis = {
+                        "full_analysis": f"{transcript['full_analysis']}\n\n{visual['full_analysis']}",
+                        "transcript_analysis": transcript["full_analysis"],
+                        "visual_analysis": visual["full_analysis"],
+                        "model_used": transcript["model_used"],
+                        "prompt": [TRANSCRIPT_ANALYSIS_PROMPT, VISUAL_ANALYSIS_PROMPT]
+                    }
+            else:
+                # Use Gemini for comprehensive analysis (includes both transcript and visuals)
+                print("Performing Gemini video analysis...")
+                
+                success, analysis, error = await asyncio.to_thread(
+                    _generate_video_analysis,
+                    video,
+                    custom_prompt
+                )
+            
+            # Release the inline video bytes (if any) before building the response
+            del video
             
             if not success:
                 return {
@@ -242,7 +506,7 @@ def analyze_video(
                 print(f"Warning: Could not cleanup temp file: {e}")
 
 
-def analyze_video_transcript_only(
+async def analyze_video_transcript_only(
     source: str,
     source_type: str = "auto",
     language_code: str = "en-US",
@@ -260,26 +524,17 @@ def analyze_video_transcript_only(
     Returns:
         Dict with transcript and audio analysis
     """
-    custom_prompt = """Transcribe all spoken words in this video. Provide:
-
-1. FULL TRANSCRIPT: Complete word-for-word transcription with timestamps
-2. SPEAKERS: Identify different speakers if multiple people speak
-3. KEY TOPICS: Main topics discussed
-4. SUMMARY: Brief summary of what was said
-
-Format the transcript clearly with timestamps."""
-    
-    return analyze_video(
+    return await analyze_video(
         source=source,
         source_type=source_type,
         analysis_type="transcript",
-        custom_prompt=custom_prompt,
+        custom_prompt=TRANSCRIPT_ANALYSIS_PROMPT,
         language_code=language_code,
         tool_context=tool_context
     )
 
 
-def analyze_video_visuals_only(
+async def analyze_video_visuals_only(
     source: str,
     source_type: str = "auto",
     tool_context: ToolContext = None
@@ -295,28 +550,16 @@ def analyze_video_visuals_only(
     Returns:
         Dict with visual analysis results
     """
-    custom_prompt = """Analyze the visual content of this video. Provide:
-
-1. SCENE BREAKDOWN: Describe each major scene or segment
-2. VISUAL ELEMENTS: Key visual elements, objects, people, settings
-3. ACTIONS: What actions and events occur
-4. TEXT ON SCREEN: Any text, captions, or graphics shown
-5. VISUAL STYLE: Cinematography, editing style, visual quality
-6. KEY FRAMES: Describe important moments or frames
-7. OVERALL NARRATIVE: Visual story being told
-
-Focus only on what can be seen, not audio content."""
-    
-    return analyze_video(
+    return await analyze_video(
         source=source,
         source_type=source_type,
         analysis_type="visual",
-        custom_prompt=custom_prompt,
+        custom_prompt=VISUAL_ANALYSIS_PROMPT,
         tool_context=tool_context
     )
 
 
-def analyze_video_with_custom_prompt(
+async def analyze_video_with_custom_prompt(
     source: str,
     analysis_prompt: str,
     source_type: str = "auto",
@@ -330,12 +573,15 @@ def analyze_video_with_custom_prompt(
         source: Either a YouTube URL or path to local MP4 file
         analysis_prompt: Custom prompt describing what to analyze
         source_type: Type of source - "youtube", "file", or "auto" (default: "auto")
+        analysis_type: "full", "visual", or "transcript" (default: "full"). For YouTube
+            sources "transcript" downloads the audio track only, so use it only when the
+            prompt is about what is said; questions about visuals need "full" or "visual"
         tool_context: Tool context (optional for session actions)
 
     Returns:
         Dict with custom analysis results
     """
-    return analyze_video(
+    return await analyze_video(
         source=source,
         source_type=source_type,
         analysis_type=analysis_type,
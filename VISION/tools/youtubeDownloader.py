@@ -1,86 +1,173 @@
 # DevTools/lookup_tools.py
 from google.adk.tools.tool_context import ToolContext
-from urllib.parse import urlparse
-import re, importlib, os, requests
 from typing import Dict, Any
+import asyncio
+import functools
 import os
+import shutil
 import sys
-import yt_dlp
+import time
 
 """
 YouTube Video Downloader
 Downloads YouTube videos as MP4 files to the downloads folder.
 """
 
-def check_ffmpeg():
-    """Check if ffmpeg is available."""
+# Number of DASH/HLS fragments fetched in parallel (override with VISION_YTDLP_CONCURRENCY)
+DEFAULT_FRAGMENT_CONCURRENCY = 8
+# Single-file formats are requested in ranged chunks of this size
+HTTP_CHUNK_SIZE = 10 * 1024 * 1024
+# Below this rate (bytes/s) the stream is treated as throttled and re-extracted
+THROTTLED_RATE = 100_000
+# Paths under the VISION package, resolved once at import
+_VISION_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DOWNLOADS = os.path.join(_VISION_DIR, "downloads")
+# yt-dlp player/signature cache, kept across runs
+_YTDLP_CACHE = os.path.join(_VISION_DIR, ".cache", "yt-dlp")
+
+# Minimum seconds between progress line redraws
+PROGRESS_INTERVAL = 0.2
+
+# Monotonic time of the last progress redraw
+_last_progress = [0.0]
+
+# Progress redraws only make sense on a terminal (the agent runtime pipes stdout)
+_INTERACTIVE = sys.stdout.isatty()
+
+# Fixed output directories already created by this process
+_ensured = set()
+
+
+def _ensure_dir(path):
+    """
+    Create an output directory if needed.
+    Only _DOWNLOADS is remembered: callers such as analyze_video pass a fresh
+    mkdtemp() directory per call that is deleted afterwards, so memoizing those
+    would grow the set forever. yt-dlp recreates a directory removed later on.
+    """
+    if path in _ensured:
+        return
+    os.makedirs(path, exist_ok=True)
+    if path == _DOWNLOADS:
+        _ensured.add(path)
+
+
+def _fragment_concurrency():
+    """Parallel fragment downloads, read at call time so values from .env apply."""
     try:
-        import subprocess
-        result = subprocess.run(['ffmpeg', '-version'], 
-                              capture_output=True, 
-                              text=True, 
-                              timeout=5)
-        return result.returncode == 0
-    except:
-        return False
+        value = int(os.getenv('VISION_YTDLP_CONCURRENCY', DEFAULT_FRAGMENT_CONCURRENCY))
+    except ValueError:
+        return DEFAULT_FRAGMENT_CONCURRENCY
+    return value if value > 0 else DEFAULT_FRAGMENT_CONCURRENCY
 
 
-def _download_video_internal(url, output_path="downloads"):
+@functools.lru_cache(maxsize=1)
+def check_ffmpeg():
+    """Check if ffmpeg is available (looked up on PATH once per process)."""
+    return shutil.which('ffmpeg') is not None
+
+
+@functools.lru_cache(maxsize=1)
+def _impersonate_target():
+    """Chrome impersonation target if yt-dlp's curl_cffi backend is usable, else None."""
+    try:
+        # Raises ImportError when curl_cffi is missing or an unsupported version
+        import yt_dlp.networking._curlcffi
+    except ImportError:
+        return None
+    from yt_dlp.networking.impersonate import ImpersonateTarget
+    return ImpersonateTarget('chrome')
+
+def _download_video_internal(url, output_path="downloads", audio_only=False, max_height=None):
     """
     Internal function to download a YouTube video as MP4.
     
     Args:
         url (str): YouTube video URL
         output_path (str): Directory to save the downloaded video
+        audio_only (bool): Download only the audio track (much smaller, enough for transcripts)
+        max_height (int): Prefer video no taller than this many pixels (None for best quality)
     
     Returns:
         tuple: (success: bool, video_path: str, error: str)
     """
+    # Deferred: yt-dlp's extractor registry is large and most sessions never download
+    import yt_dlp
+    
+    abs_out = os.path.abspath(output_path)
+    
     # Create output directory if it doesn't exist
-    os.makedirs(output_path, exist_ok=True)
+    _ensure_dir(abs_out)
     
     # Check for ffmpeg and adjust format accordingly
     has_ffmpeg = check_ffmpeg()
     
-    if has_ffmpeg:
-        # If ffmpeg is available, download best quality (may require merging)
-        format_string = 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best'
+    format_sort = []
+    if audio_only:
+        # Audio-only streams are pre-encoded, no merging needed
+        format_string = 'bestaudio[ext=m4a]/bestaudio'
+    elif has_ffmpeg:
+        # If ffmpeg is available, download best quality (may require merging);
+        # the sort ranks mp4/m4a first so one pass picks streams that remux into mp4
+        format_string = 'bv*+ba/b'
+        # ('res:N' prefers the largest resolution up to N, falling back to the smallest above it)
+        format_sort = ['ext:mp4:m4a', f'res:{max_height}' if max_height else 'res', 'codec:h264']
     else:
         # If no ffmpeg, download pre-merged formats only (may be lower quality)
         print("⚠️  ffmpeg not detected. Downloading pre-merged format (may be lower quality).")
         print("   For best quality, install ffmpeg: https://ffmpeg.org/download.html\n")
         # Use format that's guaranteed to be pre-merged
         format_string = 'best[ext=mp4][vcodec^=avc]/best[ext=mp4]/bestvideo[ext=mp4]+bestaudio[ext=m4a]/best'
+        if max_height:
+            format_string = f'best[height<={max_height}][ext=mp4]/' + format_string
     
     # Configure yt-dlp options
     ydl_opts = {
         'format': format_string,
-        'outtmpl': os.path.join(output_path, '%(title)s.%(ext)s'),
-        'merge_output_format': 'mp4',
+        'format_sort': format_sort,
+        'outtmpl': os.path.join(abs_out, '%(title)s.%(ext)s'),
         'quiet': False,
         'no_warnings': False,
         'progress_hooks': [progress_hook],
-        'postprocessor_args': ['-codec', 'copy'] if has_ffmpeg else [],
-        'prefer_ffmpeg': has_ffmpeg,
+        'concurrent_fragment_downloads': _fragment_concurrency(),
+        'http_chunk_size': HTTP_CHUNK_SIZE,
+        'retries': 10,
+        'fragment_retries': 10,
+        'throttledratelimit': THROTTLED_RATE,
+        # Watch URLs carrying ?list=... download only the video, not the playlist
+        'noplaylist': True,
+        'socket_timeout': 30,
+        'cachedir': _YTDLP_CACHE,
     }
     
+    # Merge/remux options only mean something when ffmpeg can run them
+    if has_ffmpeg:
+        ydl_opts.update({
+            'merge_output_format': 'mp4',
+            # Scoped to the merger: stream-copy both tracks and put the moov atom up front
+            'postprocessor_args': {'merger': ['-c', 'copy', '-movflags', '+faststart']},
+            'prefer_ffmpeg': True,
+        })
+    
+    # Chrome TLS/HTTP2 fingerprint via curl_cffi (reuses connections across fragments)
+    impersonate = _impersonate_target()
+    if impersonate is not None:
+        ydl_opts['impersonate'] = impersonate
+    
     try:
         print(f"Downloading video from: {url}")
-        print(f"Output directory: {os.path.abspath(output_path)}\n")
+        print(f"Output directory: {abs_out}\n")
         
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            # Extract video info
-            info = ydl.extract_info(url, download=False)
+            # Extract video info and download in a single pass
+            info = ydl.extract_info(url, download=True)
             video_title = info.get('title', 'Unknown')
-            print(f"Video: {video_title}\n")
-            
-            # Download the video
-            ydl.download([url])
+            print(f"\nVideo: {video_title}")
             
             # Get the actual file path
             video_path = ydl.prepare_filename(info)
             
-        print(f"\n✓ Download complete! Video saved to: {os.path.abspath(output_path)}")
+        print(f"\n✓ Download complete! Video saved to: {abs_out}")
         return True, video_path, None
         
     except Exception as e:
@@ -90,13 +177,22 @@ def _download_video_internal(url, output_path="downloads"):
 
 
 def progress_hook(d):
-    """Hook to display download progress."""
+    """Hook to display download progress (at most one update per PROGRESS_INTERVAL)."""
     if d['status'] == 'downloading':
-        percent = d.get('_percent_str', 'N/A')
-        speed = d.get('_speed_str', 'N/A')
-        eta = d.get('_eta_str', 'N/A')
-        print(f"\rProgress: {percent} | Speed: {speed} | ETA: {eta}", end='')
+        if not _INTERACTIVE:
+            return
+        now = time.monotonic()
+        if now - _last_progress[0] < PROGRESS_INTERVAL:
+            return
+        _last_progress[0] = now
+        sys.stdout.write(
+            f"\rProgress: {d.get('_percent_str', 'N/A')} | "
+            f"Speed: {d.get('_speed_str', 'N/A')} | "
+            f"ETA: {d.get('_eta_str', 'N/A')}"
+        )
+        sys.stdout.flush()
     elif d['status'] == 'finished':
+        _last_progress[0] = 0.0
         print(f"\n\nProcessing video...")
 
 def download_video(
@@ -113,18 +209,38 @@ def download_video(
     Returns:
         Dict with download status, video path, and any error messages.
     """
-    # Get the script's directory and set downloads path relative to it
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    parent_dir = os.path.dirname(script_dir)
-    downloads_path = os.path.join(parent_dir, "downloads")
-    
     # Download the video
-    success, video_path, error = _download_video_internal(url, downloads_path)
+    success, video_path, error = _download_video_internal(url, _DOWNLOADS)
     
+    return _download_result(success, video_path, error)
+
+
+async def download_video_async(
+    url: str,
+    tool_context: ToolContext = None
+) -> Dict[str, Any]:
+    """
+    Download a YouTube video as MP4 without blocking other tool calls.
+
+    Args:
+        url: The YouTube video URL to download.
+        tool_context: Tool context (optional for session actions).
+
+    Returns:
+        Dict with download status, video path, and any error messages.
+    """
+    # yt-dlp is blocking; run it on a worker thread so the agent loop stays free
+    success, video_path, error = await asyncio.to_thread(_download_video_internal, url, _DOWNLOADS)
+    
+    return _download_result(success, video_path, error)
+
+
+def _download_result(success, video_path, error):
+    """Build the tool response dict for a download attempt."""
     return {
         "success": success,
         "video_path": video_path if success else None,
-        "download_directory": os.path.abspath(downloads_path),
+        "download_directory": _DOWNLOADS,
         "error": error,
         "message": f"Video downloaded successfully to {video_path}" if success else f"Failed to download video: {error}"
-    }
\ No newline at end of file
+    }